@@ -1,8 +1,7 @@
 import streamlit as st
-import pandas as pd
-import numpy as np
-import time
-import uuid
+import json
+import random
+from collections import deque
 
 # --- Page Configuration ---
 st.set_page_config(
@@ -11,36 +10,143 @@ st.set_page_config(
     layout="wide",
 )
 
+# --- Visualization Templates ---
+# Beyond this many bags the HTML chip view is replaced by a virtualized st.dataframe
+CHIP_VIEW_LIMIT = 50
+QUEUE_WRAPPER_OPEN = "<div style='display: flex; flex-wrap: wrap; gap: 10px; padding: 10px; border: 2px solid #555; border-radius: 10px; background-color: #f0f2f6;'>"
+QUEUE_WRAPPER_CLOSE = "</div>"
+QUEUE_ITEM = "<div style='background-color: #4A90E2; color: white; padding: 15px 20px; border-radius: 8px; font-weight: bold; font-family: monospace;'>🧳 {}</div>"
+STACK_WRAPPER_OPEN = "<div style='display: flex; flex-direction: column; align-items: center; gap: 10px; padding: 10px; border: 2px solid #555; border-radius: 10px; background-color: #f0f2f6;'>"
+STACK_WRAPPER_CLOSE = "</div>"
+STACK_ITEM = "<div style='background-color: #D0021B; color: white; padding: 15px 20px; border-radius: 8px; font-weight: bold; font-family: monospace; width: 80%; text-align: center;'>📝 {}</div>"
+
+# --- Page Headers ---
+# Static title and explanation for each page, emitted as a single st.markdown call
+QUEUE_HEADER_MD = """## 1. Baggage Processing Queue (FIFO)
+
+> ➡️ A **Queue** is a linear data structure following the **First-In, First-Out (FIFO)** principle. Like a line at a checkout counter, the first item added is the first one to be removed.
+>
+> **Use Case:** This perfectly models the main baggage processing line. Bags are checked in (added to the end of the queue) and are later processed for loading (removed from the front) in the same order.
+"""
+
+STACK_HEADER_MD = """## 2. Misplaced Baggage Stack (LIFO)
+
+> 📚 A **Stack** is a linear data structure following the **Last-In, First-Out (LIFO)** principle. Like a stack of plates, you add a new plate to the top and also remove one from the top.
+>
+> **Use Case:** This is useful for managing misplaced baggage reports. As new reports come in, they are added to the top of the stack. The resolution team typically works on the most recent cases first, so they would take a report from the top to investigate.
+"""
+
+HASH_TABLE_HEADER_MD = """## 3. Passenger Information (Hash Table / Dictionary)
+
+> 🔑 A **Hash Table** (a `dictionary` in Python) stores data in **key-value** pairs. It uses a hash function to map keys to values, allowing for extremely fast data retrieval (average time complexity of O(1)).
+>
+> **Use Case:** Ideal for quickly retrieving passenger info. Using a unique Passenger ID as the key, the system can instantly pull up all associated details (name, flight, destination) without searching through a long list.
+"""
+
+GRAPH_HEADER_MD = """## 4. Efficiency Analysis (Graph)
+
+> 📊 A **Graph** is a non-linear data structure of nodes and edges. A line chart, as used here, is a simple form of a graph that visualizes the relationship between two variables.
+>
+> **Use Case:** We can track operational efficiency over time. By plotting the number of bags processed per hour, airport management can quickly identify peak times, spot bottlenecks, and analyze trends to optimize resource allocation.
+"""
+
 # --- Helper Functions ---
 def get_short_id():
     """Generates a short, unique ID for bags."""
-    return str(uuid.uuid4())[:8].upper()
+    # IDs are not security-sensitive, so 32 random bits formatted as uppercase hex suffice
+    return f"{random.getrandbits(32):08X}"
+
+@st.cache_resource
+def _rng():
+    """Returns a shared NumPy random generator; only the graph page calls this, so NumPy is imported there."""
+    import numpy as np
+    return np.random.default_rng()
+
+@st.cache_data
+def _seed_passenger_db():
+    """Builds the seed passenger records once and memoizes them across sessions."""
+    return {
+        "PAX-001": {"name": "John Doe", "flight": "UA123", "destination": "SFO", "bag_id": get_short_id()},
+        "PAX-002": {"name": "Jane Smith", "flight": "DL456", "destination": "JFK", "bag_id": get_short_id()},
+        "PAX-003": {"name": "Peter Jones", "flight": "AA789", "destination": "LAX", "bag_id": get_short_id()}
+    }
+
+def _add_passenger(passenger_id, details):
+    """Adds a passenger record and refreshes the cached tuple of passenger IDs."""
+    st.session_state.passenger_db[passenger_id] = details
+    st.session_state.passenger_ids = tuple(st.session_state.passenger_db)
+    st.session_state.passenger_db_version += 1
+
+def _passenger_db_json():
+    """Returns the passenger dictionary as JSON, re-serializing only after it changes."""
+    version = st.session_state.passenger_db_version
+    cached = st.session_state.get('passenger_db_json')
+    if cached is None or cached[0] != version:
+        cached = (version, json.dumps(st.session_state.passenger_db))
+        st.session_state.passenger_db_json = cached
+    return cached[1]
+
+def _efficiency_frame():
+    """Builds the hour-indexed efficiency DataFrame from the session's backing lists."""
+    import pandas as pd
+    # Explicit int32 columns avoid dtype inference over boxed Python ints
+    return pd.DataFrame(
+        {'Bags Processed': st.session_state.efficiency_counts},
+        index=pd.Index(st.session_state.efficiency_hours, dtype='int32', name='Hour'),
+        dtype='int32'
+    )
+
+def _add_bag_to_queue():
+    """Button callback: enqueues the entered bag ID and puts a fresh ID in the input."""
+    bag_id = st.session_state.new_bag
+    # Guards against an empty input, e.g. the widget state being dropped on Queue -> Stack -> Queue
+    if not bag_id.strip():
+        st.toast("Enter a bag ID before adding it to the queue.", icon="⚠️")
+        return
+    st.session_state.baggage_queue.append(bag_id)
+    st.toast(f"Bag `{bag_id}` added to the queue.", icon="✅")
+    # Callbacks run before the widgets are rendered, so the widget key can be updated here
+    st.session_state.new_bag = get_short_id()
+
+def _report_misplaced_bag():
+    """Button callback: pushes the entered bag ID onto the stack and puts a fresh ID in the input."""
+    bag_id = st.session_state.misplaced_bag
+    if not bag_id.strip():
+        st.toast("Enter a bag ID before reporting it.", icon="⚠️")
+        return
+    st.session_state.misplaced_stack.append(bag_id)
+    st.toast(f"Report for bag `{bag_id}` added to the stack.", icon="✅")
+    st.session_state.misplaced_bag = get_short_id()
 
 # --- Initialize Session State ---
 def initialize_state():
-    """Initializes the session state variables if they don't exist."""
-    if 'baggage_queue' not in st.session_state:
-        # Start with a few bags in the queue
-        st.session_state.baggage_queue = [get_short_id() for _ in range(3)]
-
-    if 'misplaced_stack' not in st.session_state:
-        # Start with a couple of misplaced bag reports
-        st.session_state.misplaced_stack = [get_short_id() for _ in range(2)]
-
-    if 'passenger_db' not in st.session_state:
-        # Pre-populate a dictionary of passengers
-        st.session_state.passenger_db = {
-            "PAX-001": {"name": "John Doe", "flight": "UA123", "destination": "SFO", "bag_id": get_short_id()},
-            "PAX-002": {"name": "Jane Smith", "flight": "DL456", "destination": "JFK", "bag_id": get_short_id()},
-            "PAX-003": {"name": "Peter Jones", "flight": "AA789", "destination": "LAX", "bag_id": get_short_id()}
-        }
-
-    if 'efficiency_data' not in st.session_state:
-        # Create initial data for the efficiency graph
-        st.session_state.efficiency_data = pd.DataFrame({
-            'Hour': list(range(1, 6)),
-            'Bags Processed': np.random.randint(80, 150, size=5)
-        })
+    """Initializes the session state variables on the first run of a session."""
+    # A single sentinel check keeps every later rerun to one membership test. Only plain
+    # state belongs behind it; widget keys are seeded by their pages since Streamlit can drop them.
+    if st.session_state.get('_initialized'):
+        return
+
+    # Start with a few bags in the queue
+    st.session_state.baggage_queue = deque(get_short_id() for _ in range(3))
+
+    # Start with a couple of misplaced bag reports
+    st.session_state.misplaced_stack = [get_short_id() for _ in range(2)]
+
+    # Pre-populate a dictionary of passengers, copied so each session can mutate its own
+    st.session_state.passenger_db = dict(_seed_passenger_db())
+    # Cached key tuple for the lookup selectbox; refresh it whenever the dictionary changes
+    st.session_state.passenger_ids = tuple(st.session_state.passenger_db)
+    # Bumped on every write so the serialized JSON view can be reused between reruns
+    st.session_state.passenger_db_version = 0
+
+    # Create initial data for the efficiency graph. Kept as plain lists so
+    # each simulated hour is an O(1) append; DataFrames are built on render.
+    # The seed counts use the stdlib random module so that only the graph page imports numpy.
+    st.session_state.efficiency_hours = list(range(1, 6))
+    st.session_state.efficiency_counts = [random.randint(80, 149) for _ in range(5)]
+    st.session_state.last_hour = 5
+
+    st.session_state._initialized = True
 
 # Call the initialization function at the start of the script
 initialize_state()
@@ -48,97 +154,93 @@ initialize_state()
 
 # --- UI Functions for Each Data Structure Page ---
 
+@st.fragment
 def page_queue():
     """Renders the baggage processing queue simulation page."""
-    st.header("1. Baggage Processing Queue (FIFO)")
-    st.info("""
-    A **Queue** is a linear data structure following the **First-In, First-Out (FIFO)** principle. Like a line at a checkout counter, the first item added is the first one to be removed.
-
-    **Use Case:** This perfectly models the main baggage processing line. Bags are checked in (added to the end of the queue) and are later processed for loading (removed from the front) in the same order.
-    """, icon="➡️")
+    queue = st.session_state.baggage_queue
+    st.markdown(QUEUE_HEADER_MD)
 
     col1, col2 = st.columns([1, 2])
 
     with col1:
         st.subheader("Actions")
-        new_bag_id = st.text_input("Enter New Baggage ID", value=get_short_id(), key="new_bag")
-        if st.button("✈️ Add Bag to Queue"):
-            st.session_state.baggage_queue.append(new_bag_id)
-            st.success(f"Bag `{new_bag_id}` added to the queue.")
-            time.sleep(0.5)
-            st.rerun()
+        # Streamlit drops a widget's state on any run where it isn't rendered (e.g. Queue -> Stack -> Queue),
+        # so the default ID is re-seeded here rather than once per session
+        if 'new_bag' not in st.session_state:
+            st.session_state.new_bag = get_short_id()
+        st.text_input("Enter New Baggage ID", key="new_bag")
+        st.button("✈️ Add Bag to Queue", on_click=_add_bag_to_queue)
 
         if st.button("✅ Process Next Bag"):
-            if st.session_state.baggage_queue:
-                processed_bag = st.session_state.baggage_queue.pop(0)
+            if queue:
+                processed_bag = st.session_state.baggage_queue.popleft()
                 st.info(f"Processed Bag: `{processed_bag}`")
             else:
                 st.warning("The baggage queue is empty!")
-            time.sleep(0.5)
 
     with col2:
         st.subheader("Current Baggage Queue Visualization")
-        if not st.session_state.baggage_queue:
+        if not queue:
             st.info("Queue is empty. All bags have been processed!")
         else:
             st.markdown("`[Front of Queue]` ->")
-            queue_html = "<div style='display: flex; flex-wrap: wrap; gap: 10px; padding: 10px; border: 2px solid #555; border-radius: 10px; background-color: #f0f2f6;'>"
-            for bag in st.session_state.baggage_queue:
-                queue_html += f"<div style='background-color: #4A90E2; color: white; padding: 15px 20px; border-radius: 8px; font-weight: bold; font-family: monospace;'>🧳 {bag}</div>"
-            queue_html += "</div>"
-            st.markdown(queue_html, unsafe_allow_html=True)
+            if len(queue) > CHIP_VIEW_LIMIT:
+                import pandas as pd
+                st.dataframe(pd.DataFrame({'Bag ID': list(queue)}), use_container_width=True)
+            else:
+                parts = [QUEUE_WRAPPER_OPEN]
+                parts.extend(QUEUE_ITEM.format(bag) for bag in queue)
+                parts.append(QUEUE_WRAPPER_CLOSE)
+                st.markdown("".join(parts), unsafe_allow_html=True)
             st.markdown("`<- [Back of Queue]`")
 
 
+@st.fragment
 def page_stack():
     """Renders the misplaced baggage stack simulation page."""
-    st.header("2. Misplaced Baggage Stack (LIFO)")
-    st.info("""
-    A **Stack** is a linear data structure following the **Last-In, First-Out (LIFO)** principle. Like a stack of plates, you add a new plate to the top and also remove one from the top.
-
-    **Use Case:** This is useful for managing misplaced baggage reports. As new reports come in, they are added to the top of the stack. The resolution team typically works on the most recent cases first, so they would take a report from the top to investigate.
-    """, icon="📚")
+    stack = st.session_state.misplaced_stack
+    st.markdown(STACK_HEADER_MD)
 
     col1, col2 = st.columns([1, 2])
 
     with col1:
         st.subheader("Actions")
-        misplaced_bag_id = st.text_input("Enter Misplaced Bag ID", value=get_short_id(), key="misplaced_bag")
-        if st.button("❗️ Report Misplaced Bag"):
-            st.session_state.misplaced_stack.append(misplaced_bag_id)
-            st.success(f"Report for bag `{misplaced_bag_id}` added to the stack.")
-            time.sleep(0.5)
-            st.rerun()
+        # Re-seeded for the same reason as the queue page's input
+        if 'misplaced_bag' not in st.session_state:
+            st.session_state.misplaced_bag = get_short_id()
+        st.text_input("Enter Misplaced Bag ID", key="misplaced_bag")
+        st.button("❗️ Report Misplaced Bag", on_click=_report_misplaced_bag)
 
         if st.button("🔍 Investigate Last Report"):
-            if st.session_state.misplaced_stack:
+            if stack:
                 investigated_bag = st.session_state.misplaced_stack.pop()
                 st.info(f"Investigating report for Bag: `{investigated_bag}`")
             else:
                 st.warning("No misplaced baggage reports to investigate!")
-            time.sleep(0.5)
 
     with col2:
         st.subheader("Current Misplaced Reports Stack")
-        if not st.session_state.misplaced_stack:
+        if not stack:
             st.success("No reports in the stack. Great work!")
         else:
             st.markdown("`[Top of Stack]`")
-            stack_html = "<div style='display: flex; flex-direction: column; align-items: center; gap: 10px; padding: 10px; border: 2px solid #555; border-radius: 10px; background-color: #f0f2f6;'>"
-            for bag in reversed(st.session_state.misplaced_stack):
-                stack_html += f"<div style='background-color: #D0021B; color: white; padding: 15px 20px; border-radius: 8px; font-weight: bold; font-family: monospace; width: 80%; text-align: center;'>📝 {bag}</div>"
-            stack_html += "</div>"
-            st.markdown(stack_html, unsafe_allow_html=True)
+            # One C-level slice gives the top-first order for either view
+            reversed_stack = stack[::-1]
+            if len(reversed_stack) > CHIP_VIEW_LIMIT:
+                import pandas as pd
+                st.dataframe(pd.DataFrame({'Bag ID': reversed_stack}), use_container_width=True)
+            else:
+                parts = [STACK_WRAPPER_OPEN]
+                parts.extend(STACK_ITEM.format(bag) for bag in reversed_stack)
+                parts.append(STACK_WRAPPER_CLOSE)
+                st.markdown("".join(parts), unsafe_allow_html=True)
 
 
+@st.fragment
 def page_hash_table():
     """Renders the passenger lookup (hash table) simulation page."""
-    st.header("3. Passenger Information (Hash Table / Dictionary)")
-    st.info("""
-    A **Hash Table** (a `dictionary` in Python) stores data in **key-value** pairs. It uses a hash function to map keys to values, allowing for extremely fast data retrieval (average time complexity of O(1)).
-
-    **Use Case:** Ideal for quickly retrieving passenger info. Using a unique Passenger ID as the key, the system can instantly pull up all associated details (name, flight, destination) without searching through a long list.
-    """, icon="🔑")
+    db = st.session_state.passenger_db
+    st.markdown(HASH_TABLE_HEADER_MD)
 
     col1, col2 = st.columns(2)
 
@@ -146,12 +248,12 @@ def page_hash_table():
         st.subheader("Find Passenger by ID")
         passenger_id_to_find = st.selectbox(
             "Select a Passenger ID to look up",
-            options=list(st.session_state.passenger_db.keys())
+            options=st.session_state.passenger_ids
         )
 
         if st.button("👤 Find Passenger Details"):
-            if passenger_id_to_find in st.session_state.passenger_db:
-                details = st.session_state.passenger_db[passenger_id_to_find]
+            details = db.get(passenger_id_to_find)
+            if details is not None:
                 st.success(f"Passenger Found for ID: `{passenger_id_to_find}`")
                 st.json(details)
             else:
@@ -159,41 +261,45 @@ def page_hash_table():
 
     with col2:
         st.subheader("Underlying Data Structure (Dictionary)")
-        st.json(st.session_state.passenger_db)
+        st.json(_passenger_db_json(), expanded=False)
 
 
+@st.fragment
 def page_graph():
     """Renders the efficiency graph visualization page."""
-    st.header("4. Efficiency Analysis (Graph)")
-    st.info("""
-    A **Graph** is a non-linear data structure of nodes and edges. A line chart, as used here, is a simple form of a graph that visualizes the relationship between two variables.
+    import pandas as pd
 
-    **Use Case:** We can track operational efficiency over time. By plotting the number of bags processed per hour, airport management can quickly identify peak times, spot bottlenecks, and analyze trends to optimize resource allocation.
-    """, icon="📊")
+    st.markdown(GRAPH_HEADER_MD)
 
     st.subheader("Bags Processed Per Hour")
 
-    chart = st.line_chart(
-        st.session_state.efficiency_data.set_index('Hour')
-    )
+    # Built once per rerun and shared by the chart and the table below
+    indexed = _efficiency_frame()
+    chart = st.line_chart(indexed)
+    new_row = None
 
     if st.button("📈 Simulate Next Hour"):
-        last_hour = st.session_state.efficiency_data['Hour'].max()
-        new_hour = last_hour + 1
-        new_processed_count = np.random.randint(80, 150)
+        new_hour = st.session_state.last_hour + 1
+        st.session_state.last_hour = new_hour
+        new_processed_count = int(_rng().integers(80, 150))
         
-        new_data = pd.DataFrame({'Hour': [new_hour], 'Bags Processed': [new_processed_count]})
+        # Appending to the backing lists is O(1); no DataFrame is copied per click.
+        st.session_state.efficiency_hours.append(new_hour)
+        st.session_state.efficiency_counts.append(new_processed_count)
         
-        # In a real app, you would append to the existing DataFrame.
-        # For Streamlit's st.line_chart.add_rows, we pass only the new data.
-        st.session_state.efficiency_data = pd.concat([st.session_state.efficiency_data, new_data], ignore_index=True)
-        
-        # Update the chart with the new row
-        chart.add_rows(new_data.set_index('Hour'))
+        # For Streamlit's add_rows, we pass only the new data.
+        new_row = pd.DataFrame(
+            {'Bags Processed': [new_processed_count]},
+            index=pd.Index([new_hour], dtype='int32', name='Hour'),
+            dtype='int32'
+        )
+        chart.add_rows(new_row)
         st.success(f"Simulated Hour {new_hour}: Processed {new_processed_count} bags.")
 
     st.subheader("Data Table")
-    st.dataframe(st.session_state.efficiency_data, use_container_width=True)
+    table = st.dataframe(indexed, use_container_width=True)
+    if new_row is not None:
+        table.add_rows(new_row)
 
 # --- Main App Logic ---
 